@@ -0,0 +1,248 @@
+import io
+import json
+import os
+
+import pytest
+
+from tools import conversationtool
+from tools.conversationtool import _MMAP_THRESHOLD, ConversationTool
+
+
+@pytest.fixture
+def tool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return ConversationTool()
+
+
+def save(tool, content="Hello!"):
+    conversation_data = {"messages": [{"role": "user", "content": content}]}
+    result = tool.execute(action="save", conversation_data=conversation_data)
+    return result.split("saved successfully to ", 1)[1]
+
+
+def test_list_falls_back_to_conversation_when_sidecar_is_corrupt(tool):
+    filename = save(tool)
+    sidecar = os.path.join(tool.exports_path, filename[: -len(".convo")] + ".meta.json")
+    with open(sidecar, "w", encoding="utf-8") as f:
+        f.write("[]")
+
+    conversations = json.loads(tool.execute(action="list"))
+
+    assert [c["filename"] for c in conversations] == [filename]
+    assert conversations[0]["title"] == "Hello!..."
+
+
+@pytest.mark.parametrize("count", [1, 6])
+def test_list_skips_files_with_non_object_metadata(tool, count):
+    filename = save(tool)
+    for i in range(count):
+        path = os.path.join(tool.imports_path, f"bad{i}.convo")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"metadata": None, "conversation": {}}, f)
+
+    conversations = json.loads(tool.execute(action="list"))
+
+    assert [c["filename"] for c in conversations] == [filename]
+
+
+@pytest.mark.parametrize("size", [1024, _MMAP_THRESHOLD * 4])
+def test_load_legacy_file_returns_compact_json(tool, size):
+    data = {
+        "metadata": {"title": "Legacy"},
+        "conversation": {"messages": [{"role": "user", "content": "x" * size}]},
+    }
+    path = os.path.join(tool.imports_path, "legacy.convo")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    assert os.path.getsize(path) >= size
+
+    result = tool.execute(action="load", file_path="legacy.convo")
+
+    assert json.loads(result) == data
+    assert "\n" not in result
+
+
+def test_write_atomic_replaces_file_and_leaves_no_temp_files(tool):
+    path = os.path.join(tool.exports_path, "atomic.convo")
+    tool._write_atomic(path, b"first")
+    tool._write_atomic(path, b"second")
+
+    with open(path, "rb") as f:
+        assert f.read() == b"second"
+    assert os.listdir(tool.exports_path) == ["atomic.convo"]
+
+
+def test_write_atomic_removes_temp_file_on_failure(tool, monkeypatch):
+    path = os.path.join(tool.exports_path, "atomic.convo")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        tool._write_atomic(path, b"data")
+
+    assert os.listdir(tool.exports_path) == []
+
+
+def test_list_cache_is_shared_between_instances(tool, monkeypatch):
+    filename = save(tool)
+    expected = json.loads(tool.execute(action="list"))
+    index_path = os.path.abspath(os.path.join(tool.exports_path, "index.jsonl"))
+    assert index_path in conversationtool._index_cache
+
+    def fail(self, *args):
+        raise AssertionError("unchanged files should not be read again")
+
+    monkeypatch.setattr(ConversationTool, "_read_metadata", fail)
+
+    assert json.loads(ConversationTool().execute(action="list")) == expected
+    assert [c["filename"] for c in expected] == [filename]
+
+
+def test_list_picks_up_conversation_overwritten_in_place(tool):
+    def write_legacy(title):
+        data = {"metadata": {"title": title}, "conversation": {"messages": []}}
+        with open(os.path.join(tool.imports_path, "a.convo"), "w") as f:
+            json.dump(data, f)
+
+    def titles():
+        conversations = ConversationTool().execute(action="list")
+        return [c["title"] for c in json.loads(conversations)]
+
+    write_legacy("Old")
+    assert titles() == ["Old"]
+    dir_mtime = os.stat(tool.imports_path).st_mtime_ns
+
+    write_legacy("New title")
+
+    assert os.stat(tool.imports_path).st_mtime_ns == dir_mtime
+    assert titles() == ["New title"]
+
+
+def write_jsonl(tool, name, lines):
+    with open(os.path.join(tool.imports_path, name), "wb") as f:
+        f.write(b"\n".join(lines) + b"\n")
+
+
+def test_load_splices_json_lines_messages(tool):
+    filename = save(tool, "First")
+    tool.append_message(filename, {"role": "assistant", "content": "Second"})
+
+    result = json.loads(tool.execute(action="load", file_path=filename))
+
+    assert result == tool._load_conversation(filename)
+    assert result["conversation"]["messages"] == [
+        {"role": "user", "content": "First"},
+        {"role": "assistant", "content": "Second"},
+    ]
+
+
+def test_load_rejects_truncated_json_lines_message(tool):
+    write_jsonl(
+        tool,
+        "cut.convo",
+        [
+            b'{"metadata":{"title":"Cut"},"conversation":{}}',
+            b'{"role":"user","content":"ok"}',
+            b'{"role":"user","cont',
+        ],
+    )
+
+    for pretty in (False, True):
+        with pytest.raises(Exception, match="Error loading conversation"):
+            tool.execute(action="load", file_path="cut.convo", pretty=pretty)
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_execute_stream_writes_same_bytes_as_execute(tool, pretty):
+    filename = save(tool)
+
+    for kwargs in ({"action": "load", "file_path": filename}, {"action": "list"}):
+        out = io.BytesIO()
+        tool.execute_stream(out, pretty=pretty, **kwargs)
+        assert out.getvalue().decode("utf-8") == tool.execute(pretty=pretty, **kwargs)
+
+
+def read_raw(tool, filename):
+    with open(os.path.join(tool.exports_path, filename), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("backend", ["zstd", "gzip"])
+@pytest.mark.parametrize("size", [16, _MMAP_THRESHOLD * 4])
+def test_save_append_load_round_trip(tool, monkeypatch, backend, size):
+    if backend == "zstd":
+        pytest.importorskip("zstandard")
+        magic = conversationtool._ZSTD_MAGIC
+    else:
+        monkeypatch.setattr(conversationtool, "zstandard", None)
+        magic = conversationtool._GZIP_MAGIC
+    filename = save(tool, "a" * size)
+    messages = [{"role": "user", "content": "a" * size}]
+    for i in range(3):
+        message = {"role": "assistant", "content": f"reply {i} " + "b" * size}
+        tool.append_message(filename, message)
+        messages.append(message)
+
+    assert read_raw(tool, filename).startswith(magic)
+    assert list(tool.iter_messages(filename)) == messages
+    loaded = json.loads(tool.execute(action="load", file_path=filename))
+    assert loaded["conversation"]["messages"] == messages
+    assert loaded == tool._load_conversation(filename)
+
+
+def test_zstd_conversation_needs_zstandard_to_append(tool, monkeypatch):
+    pytest.importorskip("zstandard")
+    filename = save(tool)
+    monkeypatch.setattr(conversationtool, "zstandard", None)
+
+    with pytest.raises(Exception, match="zstandard is required"):
+        tool.append_message(filename, {"role": "assistant", "content": "Hi"})
+
+
+def test_append_migrates_legacy_file_to_json_lines(tool):
+    data = {
+        "metadata": {"title": "Legacy"},
+        "conversation": {
+            "model": "test",
+            "messages": [{"role": "user", "content": "Old"}],
+        },
+    }
+    path = os.path.join(tool.imports_path, "legacy.convo")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    reply = {"role": "assistant", "content": "New"}
+
+    tool.append_message("legacy.convo", reply)
+
+    with open(path, "rb") as f:
+        lines = tool._decompress(f.read()).splitlines()
+    assert json.loads(lines[0]) == {
+        "metadata": {"title": "Legacy"},
+        "conversation": {"model": "test"},
+    }
+    assert [json.loads(line) for line in lines[1:]] == [
+        {"role": "user", "content": "Old"},
+        reply,
+    ]
+    assert list(tool.iter_messages("legacy.convo")) == [
+        {"role": "user", "content": "Old"},
+        reply,
+    ]
+
+
+def test_append_to_plain_json_lines_stays_uncompressed(tool):
+    header = b'{"metadata":{"title":"Plain"},"conversation":{}}'
+    write_jsonl(tool, "plain.convo", [header, b'{"role":"user","content":"Hi"}'])
+
+    tool.append_message("plain.convo", {"role": "assistant", "content": "Hey"})
+
+    with open(os.path.join(tool.imports_path, "plain.convo"), "rb") as f:
+        assert f.read().splitlines() == [
+            header,
+            b'{"role":"user","content":"Hi"}',
+            b'{"role":"assistant","content":"Hey"}',
+        ]
+    loaded = json.loads(tool.execute(action="load", file_path="plain.convo"))
+    assert [m["content"] for m in loaded["conversation"]["messages"]] == ["Hi", "Hey"]
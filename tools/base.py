@@ -3,6 +3,9 @@ from typing import Dict
 
 
 class BaseTool(ABC):
+    # Let subclasses opt into __slots__; others still get an instance __dict__
+    __slots__ = ()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -1,17 +1,152 @@
+import gzip
+import io
 import json
+import mmap
 import os
+import re
+import tempfile
+import threading
 import unicodedata
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from tools.base import BaseTool
 
+try:
+    import orjson
+except ImportError:
+    # orjson is an optional speedup; fall back to the stdlib encoder/decoder
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    # Without ijson, message iteration loads the whole conversation first
+    ijson = None
+
+try:
+    import zstandard
+except ImportError:
+    # Without zstandard, new conversation files are gzip-compressed instead
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no fcntl; index appends are locked with msvcrt instead
+    fcntl = None
+    import msvcrt
+
+# Magic bytes used to tell compressed conversation files from plain JSON
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _json_kwargs(pretty: bool) -> Dict[str, Any]:
+    """Keyword arguments for the stdlib encoder, compact unless pretty."""
+    if pretty:
+        return {"ensure_ascii": False, "indent": 2}
+    return {"ensure_ascii": False, "separators": (",", ":")}
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes, indented only if pretty."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, **_json_kwargs(pretty)).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        # The stdlib decoder cannot parse a memoryview directly
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _append_locked(f: IO[bytes], data: bytes) -> None:
+    """Append data to a file opened in append mode under an exclusive lock."""
+    if fcntl is not None:
+        # The lock is released when the file is closed
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        f.write(data)
+        return
+    f.seek(0)
+    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        f.write(data)
+        f.flush()
+    finally:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# Files at least this large are memory-mapped instead of read into a buffer
+_MMAP_THRESHOLD = 32 * 1024
+
+# Leading bytes of a conversation checked for the metadata key before parsing
+_HEAD_SIZE = 128
+
+# Minimum buffer size for conversation file I/O
+_MIN_BUFFER_SIZE = 128 * 1024
+
+# Per-directory index of conversation metadata, one JSON object per line
+_INDEX_FILENAME = "index.jsonl"
+
+# Listing only spins up worker threads when more files than this need reading
+_PARALLEL_THRESHOLD = 4
+
+
+# Caches and compression contexts live at module level because ce3 creates a
+# new tool instance for every tool call. Listing caches are keyed by absolute
+# path and hold a (st_mtime_ns, st_size) stamp of the file they were read from.
+_IndexEntries = Dict[str, Tuple[Tuple[int, int], Dict]]
+_cache_lock = threading.Lock()
+_index_cache: Dict[str, Tuple[Tuple[int, int], _IndexEntries]] = {}
+_meta_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
+# zstd contexts are not thread-safe, and listing reads files from a thread pool,
+# so each thread keeps its own
+_zstd_contexts = threading.local()
+
+
+def _get_compressor() -> Any:
+    """Return the calling thread's zstd compressor."""
+    compressor = getattr(_zstd_contexts, "compressor", None)
+    if compressor is None:
+        compressor = zstandard.ZstdCompressor(level=3)
+        _zstd_contexts.compressor = compressor
+    return compressor
+
+
+def _get_decompressor() -> Any:
+    """Return the calling thread's zstd decompressor."""
+    if zstandard is None:
+        raise ValueError("zstandard is required to read this conversation")
+    decompressor = getattr(_zstd_contexts, "decompressor", None)
+    if decompressor is None:
+        decompressor = zstandard.ZstdDecompressor()
+        _zstd_contexts.decompressor = decompressor
+    return decompressor
+
+
+# Anything other than word characters, spaces and dashes is dropped from filenames
+_INVALID_FILENAME_RE = re.compile(r"[^\w \-]")
+
 
 class ConversationTool(BaseTool):
     name = "conversationtool"
     description = """
     Manages conversation exports and imports.
-    - Saves conversations to JSON files with metadata
+    - Saves conversations to compressed JSON Lines files with metadata
     - Imports previously saved conversations
     - Maintains conversation context and history
     - Handles file operations with error checking
@@ -36,146 +171,600 @@ class ConversationTool(BaseTool):
                 "type": "string",
                 "description": "File path for loading conversation (required for load action)",
             },
+            "pretty": {
+                "type": "boolean",
+                "description": "Indent JSON returned by load and list (default: false)",
+            },
         },
         "required": ["action"],
     }
 
     VERSION = "1.1.0"
 
+    __slots__ = (
+        "_buffer_size",
+        "_exports_prefix",
+        "_imports_prefix",
+        "base_path",
+        "exports_path",
+        "imports_path",
+    )
+
     def __init__(self):
         super().__init__()
         self.base_path = "conversations"
         self.exports_path = os.path.join(self.base_path, "exports")
         self.imports_path = os.path.join(self.base_path, "imports")
+        self._imports_prefix = self.imports_path + os.sep
+        self._exports_prefix = self.exports_path + os.sep
 
         # Ensure all directories exist
         os.makedirs(self.exports_path, exist_ok=True)
         os.makedirs(self.imports_path, exist_ok=True)
 
-    def _generate_title(self, conversation_data: Dict) -> str:
-        """Generate a title from the first message in the conversation."""
+        # Buffer whole conversation files in a few syscalls
+        block_size = getattr(os.stat(self.exports_path), "st_blksize", 0)
+        self._buffer_size = max(4 * block_size, _MIN_BUFFER_SIZE)
+
+    def _generate_title(self, conversation_data: Dict) -> Tuple[str, str]:
+        """Generate a title and its sanitized filename form from the first message."""
         messages = conversation_data.get("messages", [])
         if not messages:
-            return "Empty Conversation"
-        first_message = messages[0].get("content", "")
-        return first_message[:50].strip() + "..."
+            return "Empty Conversation", "Empty Conversation"
+        first_message = messages[0].get("content", "")[:50].strip()
+        # The "..." suffix would be stripped by sanitizing, so leave it out there
+        return first_message + "...", self._sanitize_filename(first_message)
 
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename by removing invalid characters."""
         filename = unicodedata.normalize("NFKD", filename)
-        filename = "".join(c for c in filename if c.isalnum() or c in (" ", "-", "_"))
-        return filename.strip()
+        return _INVALID_FILENAME_RE.sub("", filename).strip()
+
+    def _compress(self, data: bytes, magic: Optional[bytes] = None) -> bytes:
+        """Compress conversation file contents.
+
+        magic selects the format of an existing file being appended to; new
+        files use zstd, or gzip as a fallback.
+        """
+        if magic is None:
+            magic = _ZSTD_MAGIC if zstandard is not None else _GZIP_MAGIC
+        if magic == _ZSTD_MAGIC:
+            if zstandard is None:
+                raise ValueError("zstandard is required to write this conversation")
+            return _get_compressor().compress(data)
+        if magic[:2] == _GZIP_MAGIC:
+            return gzip.compress(data, compresslevel=6)
+        return data
+
+    def _decompress(self, data: bytes) -> bytes:
+        """Decompress conversation file contents, passing plain JSON through."""
+        if data[:4] == _ZSTD_MAGIC:
+            # Appended messages are stored as additional frames. A memoryview
+            # keeps zstandard from reading an mmap as a stream.
+            with memoryview(data) as view:
+                return (
+                    _get_decompressor()
+                    .stream_reader(view, read_across_frames=True)
+                    .readall()
+                )
+        if data[:2] == _GZIP_MAGIC:
+            return gzip.decompress(data)
+        return data
+
+    def _parse_header(self, line: bytes) -> Optional[Dict]:
+        """Parse the first line of a JSON Lines conversation file.
+
+        Returns None when the file uses the legacy layout of a single JSON
+        document holding the messages inside the conversation object.
+        """
+        try:
+            header = _loads(line)
+        except ValueError:
+            return None
+        if (
+            not isinstance(header, dict)
+            or not isinstance(header.get("conversation"), dict)
+            or "messages" in header["conversation"]
+        ):
+            return None
+        return header
+
+    def _parse_conversation(self, buf: bytes) -> Any:
+        """Parse decompressed conversation file contents in either layout."""
+        end = buf.find(b"\n")
+        with memoryview(buf) as view:
+            header = None if end == -1 else self._parse_header(view[:end])
+            if header is None:
+                return _loads(view)
+
+            # JSON Lines layout: a header line followed by one message per line
+            messages = header["conversation"]["messages"] = []
+            start = end + 1
+            while start < len(buf):
+                end = buf.find(b"\n", start)
+                if end == -1:
+                    end = len(buf)
+                if end > start:
+                    messages.append(_loads(view[start:end]))
+                start = end + 1
+            return header
+
+    def _serialize_conversation(self, buf: bytes) -> bytes:
+        """Produce the single-document JSON for decompressed file contents.
+
+        Message lines of JSON Lines files are checked and then spliced in as
+        they are, so only the small header line gets re-encoded. Legacy single-document
+        files are parsed and re-encoded in full.
+        """
+        end = buf.find(b"\n")
+        header = None if end == -1 else self._parse_header(buf[:end])
+        if header is None:
+            # Legacy layout: re-encode so indented files also come back compact
+            with memoryview(buf) as view:
+                data = _loads(view)
+            self._validate_conversation(data)
+            return _dumps(data)
+        self._validate_conversation(header)
+
+        messages = []
+        start = end + 1
+        while start < len(buf):
+            end = buf.find(b"\n", start)
+            if end == -1:
+                end = len(buf)
+            if end > start:
+                message = buf[start:end]
+                # Parse only to reject broken lines; the bytes are used as stored
+                _loads(message)
+                messages.append(message)
+            start = end + 1
+
+        conversation = _dumps(header["conversation"])[:-1]
+        if len(conversation) > 1:
+            conversation += b","
+        return b"".join(
+            [
+                b'{"metadata":',
+                _dumps(header["metadata"]),
+                b',"conversation":',
+                conversation,
+                b'"messages":[',
+                b",".join(messages),
+                b"]}}",
+            ]
+        )
+
+    def _check_head(self, data: bytes) -> None:
+        """Reject files whose first bytes do not mention the metadata key.
+
+        Conversations are always written with metadata first, so this fails
+        fast on other files without decompressing or parsing all of them.
+        """
+        if data[:4] == _ZSTD_MAGIC:
+            with memoryview(data) as view:
+                head = _get_decompressor().stream_reader(view).read(_HEAD_SIZE)
+        elif data[:2] == _GZIP_MAGIC:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            head = decompressor.decompress(data[: _HEAD_SIZE * 8], _HEAD_SIZE)
+        else:
+            head = data[:_HEAD_SIZE]
+        if b'"metadata"' not in head:
+            raise ValueError("Invalid conversation file format")
+
+    def _read_file(self, f: IO[bytes], parse: Callable[[bytes], Any]) -> Any:
+        """Decompress an open conversation file and pass its contents to parse.
+
+        Large files are memory-mapped instead of read into a buffer.
+        """
+        if os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self._check_head(mm)
+                return parse(self._decompress(mm))
+        data = f.read()
+        self._check_head(data)
+        return parse(self._decompress(data))
+
+    def _read_json(self, f: IO[bytes]) -> Any:
+        """Parse an open conversation file in either layout."""
+        return self._read_file(f, self._parse_conversation)
+
+    def _open_stream(self, f: IO[bytes]) -> IO[bytes]:
+        """Wrap an open conversation file in a decompressing line reader."""
+        magic = f.read(4)
+        f.seek(0)
+        if magic == _ZSTD_MAGIC:
+            return io.BufferedReader(
+                _get_decompressor().stream_reader(f, read_across_frames=True)
+            )
+        if magic[:2] == _GZIP_MAGIC:
+            return gzip.GzipFile(fileobj=f)
+        return f
+
+    def _metadata_path(self, file_path: str) -> str:
+        """Return the path of the metadata sidecar for a .convo file."""
+        return file_path[: -len(".convo")] + ".meta.json"
+
+    def _read_metadata(self, file_path: str) -> Dict:
+        """Read conversation metadata, preferring the small sidecar file."""
+        try:
+            with open(self._metadata_path(file_path), "rb") as f:
+                metadata = _loads(f.read())
+            if isinstance(metadata, dict):
+                return metadata
+        except (OSError, ValueError):
+            pass
+
+        # Imported or older conversations may have a missing or unusable sidecar
+        with open(file_path, "rb", buffering=self._buffer_size) as f:
+            data = self._read_json(f)
+        return data.get("metadata", {})
+
+    def _write_atomic(self, file_path: str, data: bytes) -> None:
+        """Write data through a temporary file so readers never see a partial file."""
+        # A unique temp file per write keeps concurrent saves from interleaving
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(file_path) + ".",
+            suffix=".tmp",
+            dir=os.path.dirname(file_path) or ".",
+        )
+        try:
+            with os.fdopen(fd, "wb", buffering=self._buffer_size) as f:
+                f.write(data)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _write_conversation(
+        self, file_path: str, metadata: Dict, conversation_data: Dict
+    ) -> None:
+        """Write a conversation as JSON Lines along with its metadata sidecar.
+
+        The first line holds the metadata and the conversation without its
+        messages; each message follows on its own line.
+        """
+        header = {
+            "metadata": metadata,
+            "conversation": {
+                key: value
+                for key, value in conversation_data.items()
+                if key != "messages"
+            },
+        }
+        messages = conversation_data.get("messages", [])
+        lines = [_dumps(header)]
+        lines.extend(_dumps(message) for message in messages)
+        lines.append(b"")
+
+        self._write_atomic(file_path, self._compress(b"\n".join(lines)))
+        # The sidecar is only a few hundred bytes, so it stays uncompressed
+        self._write_atomic(self._metadata_path(file_path), _dumps(metadata))
 
     def _save_conversation(self, conversation_data: Dict) -> str:
         """Save conversation data to a file in the exports directory."""
         try:
             timestamp = datetime.now()
-            title = self._generate_title(conversation_data)
-            sanitized_title = self._sanitize_filename(title)
+            title, sanitized_title = self._generate_title(conversation_data)
 
             metadata = {
                 "timestamp": timestamp.isoformat(),
                 "conversation_id": conversation_data.get(
-                    "conversation_id", str(hash(timestamp.isoformat()))
+                    "conversation_id", uuid.uuid4().hex
                 ),
                 "model": conversation_data.get("model", "unknown"),
                 "title": title,
                 "export_date": timestamp.isoformat(),
             }
 
-            full_data = {"metadata": metadata, "conversation": conversation_data}
-
             filename = f"{sanitized_title}_{metadata['conversation_id'][:8]}.convo"
             file_path = os.path.join(self.exports_path, filename)
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(full_data, f, ensure_ascii=False, indent=2)
+            self._write_conversation(file_path, metadata, conversation_data)
+            self._append_index(self.exports_path, filename, metadata)
 
             return f"Conversation saved successfully to {filename}"
 
         except Exception as e:
             raise Exception(f"Error saving conversation: {str(e)}")
 
+    def _open_conversation(self, file_path: str) -> IO[bytes]:
+        """Open a conversation file from either imports or exports directory.
+
+        The returned binary handle yields the file as stored, which may be
+        zstd or gzip compressed. Wrap it with _open_stream to read the JSON
+        Lines contents incrementally, or use _load_conversation_bytes for the
+        single-document JSON sent to the API layer.
+        """
+        if not file_path.endswith(".convo"):
+            raise ValueError("Invalid file format. Must be a .convo file")
+
+        # Try both import and export paths
+        full_paths = (
+            self._imports_prefix + file_path,
+            self._exports_prefix + file_path,
+            file_path,  # Try the exact path as fallback
+        )
+
+        # Opening directly saves a separate existence check per candidate
+        for path in full_paths:
+            try:
+                return open(path, "rb", buffering=self._buffer_size)
+            except (FileNotFoundError, IsADirectoryError):
+                continue
+
+        raise FileNotFoundError(f"Conversation file not found: {file_path}")
+
+    def _validate_conversation(self, data: Any) -> None:
+        """Check that parsed file contents look like a saved conversation."""
+        if (
+            not isinstance(data, dict)
+            or "metadata" not in data
+            or "conversation" not in data
+        ):
+            raise ValueError("Invalid conversation file format")
+
+    def _load_conversation_bytes(self, file_path: str) -> bytes:
+        """Load a conversation as UTF-8 encoded JSON without decoding messages."""
+        try:
+            with self._open_conversation(file_path) as f:
+                return self._read_file(f, self._serialize_conversation)
+
+        except Exception as e:
+            raise Exception(f"Error loading conversation: {str(e)}")
+
     def _load_conversation(self, file_path: str) -> Dict:
         """Load conversation data from a file in either imports or exports directory."""
         try:
-            if not file_path.endswith(".convo"):
-                raise ValueError("Invalid file format. Must be a .convo file")
-
-            # Try both import and export paths
-            full_paths = [
-                os.path.join(self.imports_path, file_path),
-                os.path.join(self.exports_path, file_path),
-                file_path,  # Try the exact path as fallback
-            ]
+            with self._open_conversation(file_path) as f:
+                data = self._read_json(f)
+
+            self._validate_conversation(data)
+            return data
+
+        except Exception as e:
+            raise Exception(f"Error loading conversation: {str(e)}")
+
+    def iter_messages(self, file_path: str) -> Iterator[Dict]:
+        """Yield the messages of a saved conversation one at a time.
 
-            for path in full_paths:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+        JSON Lines files are read line by line. Legacy single-document files
+        are parsed incrementally when ijson is installed, so memory use does
+        not grow with the number of messages.
+        """
+        with self._open_conversation(file_path) as f:
+            stream = self._open_stream(f)
+            if self._parse_header(stream.readline()) is not None:
+                for line in stream:
+                    if line.strip():
+                        yield _loads(line)
+                return
 
-                    if (
-                        not isinstance(data, dict)
-                        or "metadata" not in data
-                        or "conversation" not in data
-                    ):
-                        raise ValueError("Invalid conversation file format")
+            if ijson is None:
+                f.seek(0)
+                yield from self._read_json(f)["conversation"].get("messages", [])
+                return
 
-                    return data
+            f.seek(0)
+            stream = self._open_stream(f)
+            yield from ijson.items(stream, "conversation.messages.item", use_float=True)
 
-            raise FileNotFoundError(f"Conversation file not found: {file_path}")
+    def append_message(self, file_path: str, message: Dict) -> None:
+        """Append a single message to a saved conversation.
+
+        JSON Lines files are extended in place with one more line; legacy
+        files are rewritten in the JSON Lines layout first.
+        """
+        try:
+            with self._open_conversation(file_path) as f:
+                path = f.name
+                magic = f.read(4)
+                f.seek(0)
+                header = self._parse_header(self._open_stream(f).readline())
+
+            if header is not None:
+                with open(path, "ab", buffering=self._buffer_size) as f:
+                    f.write(self._compress(_dumps(message) + b"\n", magic))
+                return
+
+            data = self._load_conversation(path)
+            conversation_data = data["conversation"]
+            conversation_data.setdefault("messages", []).append(message)
+            self._write_conversation(path, data["metadata"], conversation_data)
 
         except Exception as e:
-            raise Exception(f"Error loading conversation: {str(e)}")
+            raise Exception(f"Error appending message: {str(e)}")
+
+    def _append_index(self, directory: str, filename: str, metadata: Dict) -> None:
+        """Append a freshly saved conversation's metadata to the directory index."""
+        index_path = os.path.join(directory, _INDEX_FILENAME)
+        st = os.stat(os.path.join(directory, filename))
+        line = _dumps(
+            {
+                "filename": filename,
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "metadata": metadata,
+            }
+        )
+        with open(index_path, "ab") as f:
+            _append_locked(f, line + b"\n")
+
+    def _read_index(self, directory: str) -> _IndexEntries:
+        """Read a directory index as {filename: ((mtime_ns, size), metadata)}."""
+        index_path = os.path.join(directory, _INDEX_FILENAME)
+        try:
+            st = os.stat(index_path)
+        except FileNotFoundError:
+            return {}
+        stamp = (st.st_mtime_ns, st.st_size)
+        cache_key = os.path.abspath(index_path)
+        with _cache_lock:
+            cached = _index_cache.get(cache_key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        index: _IndexEntries = {}
+        with open(index_path, "rb", buffering=self._buffer_size) as f:
+            for line in f:
+                try:
+                    entry = _loads(line)
+                    filename = entry["filename"]
+                    file_stamp = (entry["mtime_ns"], entry["size"])
+                    metadata = entry["metadata"]
+                except (ValueError, KeyError, TypeError):
+                    # Skip blank, truncated or malformed lines; the files they
+                    # describe are simply read again
+                    continue
+                if isinstance(filename, str) and isinstance(metadata, dict):
+                    # A re-saved conversation appears again; the latest entry wins
+                    index[filename] = (file_stamp, metadata)
+
+        with _cache_lock:
+            _index_cache[cache_key] = (stamp, index)
+        return index
+
+    def _write_index(self, directory: str, index: _IndexEntries) -> None:
+        """Rewrite a directory index so it matches the files found on disk."""
+        index_path = os.path.join(directory, _INDEX_FILENAME)
+        lines = [
+            _dumps(
+                {
+                    "filename": filename,
+                    "mtime_ns": file_stamp[0],
+                    "size": file_stamp[1],
+                    "metadata": metadata,
+                }
+            )
+            for filename, (file_stamp, metadata) in index.items()
+        ]
+        lines.append(b"")
+        try:
+            self._write_atomic(index_path, b"\n".join(lines))
+            st = os.stat(index_path)
+        except OSError:
+            # Listing still works without an index, it is just slower
+            return
+        with _cache_lock:
+            _index_cache[os.path.abspath(index_path)] = (
+                (st.st_mtime_ns, st.st_size),
+                index,
+            )
+
+    def _list_directory(self, directory: str, location: str) -> List[Dict]:
+        """List conversation metadata for one directory.
+
+        A single scandir pass stats every conversation file. Index entries
+        whose mtime and size still match are used as they are; only new or
+        changed files are read, and the index is rewritten when it is out
+        of date.
+        """
+        try:
+            index = self._read_index(directory)
+        except OSError:
+            index = {}
+
+        found: List[Optional[Tuple[str, Tuple[int, int], Dict]]] = []
+        pending = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".convo"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                file_stamp = (st.st_mtime_ns, st.st_size)
+                indexed = index.get(entry.name)
+                if indexed is not None and indexed[0] == file_stamp:
+                    found.append((entry.name, file_stamp, indexed[1]))
+                    continue
+                with _cache_lock:
+                    cached_meta = _meta_cache.get(os.path.abspath(entry.path))
+                if cached_meta is not None and cached_meta[0] == file_stamp:
+                    found.append((entry.name, file_stamp, cached_meta[1]))
+                else:
+                    pending.append((len(found), entry, file_stamp))
+                    found.append(None)
+
+        def read_one(item: Tuple[int, os.DirEntry, Tuple[int, int]]) -> None:
+            position, entry, file_stamp = item
+            try:
+                metadata = self._read_metadata(entry.path)
+            except Exception:
+                return
+            if not isinstance(metadata, dict):
+                # Skip files whose metadata is not an object
+                return
+            with _cache_lock:
+                _meta_cache[os.path.abspath(entry.path)] = (file_stamp, metadata)
+            found[position] = (entry.name, file_stamp, metadata)
+
+        # Files are read and parsed independently, so overlap their I/O
+        if len(pending) > _PARALLEL_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=min(32, len(pending))) as executor:
+                list(executor.map(read_one, pending))
+        else:
+            for item in pending:
+                read_one(item)
+
+        current = {item[0]: (item[1], item[2]) for item in found if item is not None}
+        if current != index:
+            self._write_index(directory, current)
+
+        # Copy so callers cannot modify the cached entries
+        return [
+            dict(metadata, filename=filename, location=location)
+            for filename, (file_stamp, metadata) in current.items()
+        ]
 
     def _list_conversations(self) -> List[Dict]:
         """List all available conversations from both imports and exports directories."""
         conversations = []
 
         # List conversations from both directories
-        for directory in [self.exports_path, self.imports_path]:
-            for filename in os.listdir(directory):
-                if filename.endswith(".convo"):
-                    try:
-                        with open(
-                            os.path.join(directory, filename), "r", encoding="utf-8"
-                        ) as f:
-                            data = json.load(f)
-                            metadata = data.get("metadata", {})
-                            metadata["filename"] = filename
-                            metadata["location"] = (
-                                "exports"
-                                if directory == self.exports_path
-                                else "imports"
-                            )
-                            conversations.append(metadata)
-                    except Exception:
-                        continue
+        for directory, location in [
+            (self.exports_path, "exports"),
+            (self.imports_path, "imports"),
+        ]:
+            conversations.extend(self._list_directory(directory, location))
 
         return conversations
 
     def execute(self, **kwargs) -> str:
         """Execute the conversation tool with the given parameters."""
+        return self._execute_bytes(**kwargs).decode("utf-8")
+
+    def execute_stream(self, out: IO[bytes], **kwargs) -> None:
+        """Execute the tool, writing the UTF-8 encoded result to a binary stream."""
+        out.write(self._execute_bytes(**kwargs))
+
+    def _execute_bytes(self, **kwargs) -> bytes:
+        """Run the requested action, returning its UTF-8 encoded result."""
         action = kwargs.get("action")
+        pretty = bool(kwargs.get("pretty", False))
 
         if action == "save":
             conversation_data = kwargs.get("conversation_data")
             if not conversation_data:
                 raise ValueError("conversation_data is required for save action")
-            return self._save_conversation(conversation_data)
+            return self._save_conversation(conversation_data).encode("utf-8")
 
         elif action == "load":
             file_path = kwargs.get("file_path")
             if not file_path:
                 raise ValueError("file_path is required for load action")
-            data = self._load_conversation(file_path)
-            # Convert dictionary to string for Claude API compatibility
-            return json.dumps(data, ensure_ascii=False, indent=2)
+            if pretty:
+                return _dumps(self._load_conversation(file_path), pretty)
+            # Already serialized, so there is no need to decode and re-encode
+            return self._load_conversation_bytes(file_path)
 
         elif action == "list":
             conversations = self._list_conversations()
-            # Convert list to formatted string for Claude API compatibility
-            return json.dumps(conversations, ensure_ascii=False, indent=2)
+            # Serialize list for Claude API compatibility
+            return _dumps(conversations, pretty)
 
         else:
             raise ValueError("Invalid action. Must be 'save', 'load', or 'list'")